@@ -0,0 +1,97 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+r"""
+C implementation of the per-file clock/reset scan in find_clocks_with_rst.py.
+
+Matches the same patterns as CLK_RE and RST_RE:
+    .clk\s*(\s*\w+\s*)
+    .rst[_n]*\s*(\s*\w+\s*)
+The scan runs without the GIL, so the thread pool in find_clocks_with_rst.py
+scans files truly in parallel.
+
+Build in place with:
+    python setup.py build_ext --inplace
+"""
+
+import mmap
+import os
+
+from libc.string cimport memchr
+
+
+# ASCII-only character classes, matching \s and \w on bytes patterns
+# regardless of the C locale.
+cdef inline bint _is_space(unsigned char c) noexcept nogil:
+    return c == c' ' or 9 <= c <= 13
+
+
+cdef inline bint _is_word(unsigned char c) noexcept nogil:
+    return ((c'0' <= c <= c'9') or (c'a' <= c <= c'z')
+            or (c'A' <= c <= c'Z') or c == c'_')
+
+
+cdef bint _match_args(const unsigned char* p, Py_ssize_t i, Py_ssize_t n) noexcept nogil:
+    r"""Match \s*(\s*\w+\s*) starting at p[i]."""
+    cdef Py_ssize_t start
+    while i < n and _is_space(p[i]):
+        i += 1
+    if i >= n or p[i] != c'(':
+        return False
+    i += 1
+    while i < n and _is_space(p[i]):
+        i += 1
+    start = i
+    while i < n and _is_word(p[i]):
+        i += 1
+    if i == start:
+        return False
+    while i < n and _is_space(p[i]):
+        i += 1
+    return i < n and p[i] == c')'
+
+
+cdef void _scan(const unsigned char* p, Py_ssize_t n, bint* has_clk, bint* has_rst) noexcept nogil:
+    """Walk the buffer once, stopping as soon as both signals are found."""
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t j
+    cdef const unsigned char* hit
+    while i + 4 <= n:
+        hit = <const unsigned char*>memchr(p + i, c'.', n - i)
+        if hit == NULL:
+            return
+        i = hit - p
+        if i + 4 > n:
+            return
+        if not has_clk[0] and p[i + 1] == c'c' and p[i + 2] == c'l' and p[i + 3] == c'k':
+            if _match_args(p, i + 4, n):
+                has_clk[0] = True
+        elif not has_rst[0] and p[i + 1] == c'r' and p[i + 2] == c's' and p[i + 3] == c't':
+            j = i + 4
+            while j < n and (p[j] == c'_' or p[j] == c'n'):
+                j += 1
+            if _match_args(p, j, n):
+                has_rst[0] = True
+        if has_clk[0] and has_rst[0]:
+            return
+        i += 1
+
+
+def scan_file(str path):
+    """Return (has_clk, has_rst) for the file at path."""
+    cdef bint has_clk = False
+    cdef bint has_rst = False
+    cdef const unsigned char[::1] view
+
+    with open(path, 'rb') as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return False, False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = mm
+            try:
+                with nogil:
+                    _scan(&view[0], view.shape[0], &has_clk, &has_rst)
+            finally:
+                # Release the buffer so the mmap can be closed
+                view = None
+
+    return has_clk, has_rst
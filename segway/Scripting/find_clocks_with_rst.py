@@ -1,7 +1,171 @@
 import os
 import re
+import json
+import hashlib
+import mmap
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+# Optional C scanner, built with `python setup.py build_ext --inplace`
+try:
+    from clk_scan import scan_file as _scan_file_c
+except ImportError:
+    _scan_file_c = None
+
+# Optional Aho-Corasick automaton (pyahocorasick) for the literal prefixes
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Pattern to match .clk(...) and .rst_n(...) or .rst(...).
+# These are bytes patterns so they can search memory-mapped files directly.
+CLK_RE = re.compile(rb'\.clk\s*\(\s*\w+\s*\)')
+RST_RE = re.compile(rb'\.rst[_n]*\s*\(\s*\w+\s*\)')
+# Both patterns in one alternation so each file is only traversed once
+COMBINED = re.compile(b'(?P<clk>' + CLK_RE.pattern + b')|(?P<rst>' + RST_RE.pattern + b')')
+
+def _build_automaton():
+    """Build an automaton matching the .clk/.rst prefixes, or None without pyahocorasick."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word in ('.clk', '.rst'):
+        # Unicode builds take str keys, bytes builds take bytes keys
+        automaton.add_word(word if ahocorasick.unicode else word.encode(), word)
+    automaton.make_automaton()
+    return automaton
+
+_AUTOMATON = _build_automaton()
+
+# The automaton needs its own copy of the text, so it is fed one bounded
+# window at a time. Windows overlap by one byte less than the prefixes so a
+# prefix split across two windows is still found.
+AC_WINDOW = 1 << 20
+AC_OVERLAP = len('.clk') - 1
+
+# Directories that never contain design sources (simulator libraries, VCS)
+SKIP_DIRS = ('work', '.git')
+
+# Scan results are cached by (mtime, size) so repeat runs only rescan changed files.
+# The cache is loaded once per process and shared by every call.
+CACHE_FILE = Path(__file__).with_name('.clk_scan_cache.json')
+# Bump when the scan logic changes in a way the patterns alone don't capture
+SCANNER_VERSION = 1
+_scan_cache = None
+
+def _scanner_hash():
+    """Hash of the patterns and scanner version; the cache is void if they change."""
+    key = b'\n'.join((CLK_RE.pattern, RST_RE.pattern, str(SCANNER_VERSION).encode()))
+    return hashlib.sha1(key).hexdigest()
+
+def _load_cache():
+    """Load the scan cache, returning an empty cache if missing, unreadable or out of date."""
+    global _scan_cache
+    if _scan_cache is None:
+        try:
+            with open(CACHE_FILE, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        if not isinstance(cache, dict) or cache.get('scanner') != _scanner_hash():
+            cache = {}
+        _scan_cache = cache.get('files', {})
+    return _scan_cache
+
+def _save_cache(cache):
+    """Write the scan cache back next to this script."""
+    try:
+        with open(CACHE_FILE, 'w') as f:
+            json.dump({'scanner': _scanner_hash(), 'files': cache}, f)
+    except OSError:
+        pass
+
+def iter_sv(root):
+    """Yield paths of all .sv files under root, pruning work and .git directories."""
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        with os.scandir(d) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    if e.name in SKIP_DIRS:
+                        continue
+                    stack.append(e.path)
+                elif e.name.endswith('.sv'):
+                    yield e.path
+
+def _scan_buffer(buf):
+    """Return (has_clk, has_rst) for a bytes-like buffer."""
+    # Cheap literal probes first; a file without a clock is never reported,
+    # so there is no need to run the regex engine on it at all
+    if buf.find(b'.clk') == -1:
+        return False, False
+    if _AUTOMATON is not None:
+        return _scan_buffer_ac(buf)
+    if buf.find(b'.rst') == -1:
+        return bool(CLK_RE.search(buf)), False
+    
+    has_clk = has_rst = False
+    for m in COMBINED.finditer(buf):
+        if m.lastgroup == 'clk':
+            has_clk = True
+        else:
+            has_rst = True
+        if has_clk and has_rst:
+            break
+    return has_clk, has_rst
+
+def _scan_buffer_ac(buf):
+    """Return (has_clk, has_rst) using the Aho-Corasick automaton.
+    
+    The automaton finds every .clk/.rst prefix in one linear pass; the
+    regexes then only confirm the (name) tail at each hit, directly on buf.
+    This path is not zero-copy: each window of AC_WINDOW bytes is copied
+    (and decoded for unicode builds of pyahocorasick) before it is scanned.
+    """
+    has_clk = has_rst = False
+    pos = 0
+    n = len(buf)
+    while True:
+        window = buf[pos:pos + AC_WINDOW]
+        # latin-1 maps bytes to characters one to one, so offsets match buf
+        haystack = window.decode('latin-1') if ahocorasick.unicode else window
+        for end, word in _AUTOMATON.iter(haystack):
+            start = pos + end - len(word) + 1
+            if word == '.clk':
+                has_clk = has_clk or bool(CLK_RE.match(buf, start))
+            else:
+                has_rst = has_rst or bool(RST_RE.match(buf, start))
+            if has_clk and has_rst:
+                return has_clk, has_rst
+        if pos + AC_WINDOW >= n:
+            return has_clk, has_rst
+        pos += AC_WINDOW - AC_OVERLAP
+
+def _scan_one(sv_path, root_dir):
+    """Scan a single .sv file and return (relative_path, has_clk, has_rst).
+    
+    Uses the clk_scan C extension when it is built. Otherwise the file is
+    memory-mapped and searched in place, so the OS only pages in what the
+    scan touches before it stops. With pyahocorasick installed, the file is
+    instead copied one bounded window at a time for the automaton.
+    """
+    relative_path = os.path.relpath(sv_path, root_dir)
+    if _scan_file_c is not None:
+        has_clk, has_rst = _scan_file_c(sv_path)
+        return relative_path, has_clk, has_rst
+    
+    with open(sv_path, 'rb') as f:
+        # mmap cannot map an empty file
+        if f.seek(0, 2) == 0:
+            return relative_path, False, False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            has_clk, has_rst = _scan_buffer(mm)
+    
+    return relative_path, has_clk, has_rst
 
 def find_testbenches_with_clk_rst(root_dir):
     """
@@ -15,41 +179,72 @@ def find_testbenches_with_clk_rst(root_dir):
         'all_sv_files': []
     }
     
-    # Pattern to match .clk(...) and .rst_n(...) or .rst(...)
-    clk_pattern = r'\.clk\s*\(\s*\w+\s*\)'
-    rst_pattern = r'\.rst[_n]*\s*\(\s*\w+\s*\)'
-    
     root_path = Path(root_dir)
     
-    # Find all .sv files recursively
-    for sv_file in root_path.glob('**/*.sv'):
-        # Skip work directories
-        if 'work' in sv_file.parts or '.git' in sv_file.parts:
-            continue
-            
-        with open(sv_file, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        
-        relative_path = str(sv_file.relative_to(root_dir))
+    # Find all .sv files recursively, skipping work directories
+    files = list(iter_sv(str(root_path)))
+    
+    # Reuse cached results for files whose mtime and size are unchanged
+    cache = _load_cache()
+    scanned = [None] * len(files)
+    stale = []
+    seen = set()
+    for i, sv_path in enumerate(files):
+        st = os.stat(sv_path)
+        key = os.path.abspath(sv_path)
+        seen.add(key)
+        entry = cache.get(key)
+        if entry and entry[0] == st.st_mtime and entry[1] == st.st_size:
+            scanned[i] = (os.path.relpath(sv_path, root_dir), entry[2], entry[3])
+        else:
+            stale.append((i, key, st))
+    
+    # Files are independent, so read and scan them concurrently
+    with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 4) as ex:
+        fresh = ex.map(partial(_scan_one, root_dir=root_dir), [files[i] for i, _, _ in stale])
+        for (i, key, st), result in zip(stale, fresh):
+            scanned[i] = result
+            cache[key] = [st.st_mtime, st.st_size, result[1], result[2]]
+    
+    # Drop entries for files that were deleted or are outside this walk
+    gone = [key for key in cache if key not in seen]
+    for key in gone:
+        del cache[key]
+    
+    if stale or gone:
+        _save_cache(cache)
+    
+    for sv_path, (relative_path, has_clk, has_rst) in zip(files, scanned):
         results['all_sv_files'].append(relative_path)
         
-        has_clk = bool(re.search(clk_pattern, content))
-        has_rst = bool(re.search(rst_pattern, content))
-        
         if has_clk and not has_rst:
             results['files_with_clk_no_rst'].append({
                 'file': relative_path,
-                'path': str(sv_file)
+                'path': sv_path
             })
         elif has_clk and has_rst:
             results['files_with_clk_and_rst'].append({
                 'file': relative_path,
-                'path': str(sv_file)
+                'path': sv_path
             })
     
     return results
 
-def print_results(results):
+def print_results(results, style='report'):
+    """Print the results as a full report ('report') or a plain file list ('simple')."""
+    if style == 'simple':
+        _print_simple(results)
+    else:
+        _print_report(results)
+
+def _print_simple(results):
+    """Print one line per file with a clock but no reset."""
+    for item in results['files_with_clk_no_rst']:
+        print(item['file'])
+    print(f"{len(results['files_with_clk_no_rst'])} of {len(results['all_sv_files'])} "
+          f"files have a clock but no reset")
+
+def _print_report(results):
     """Print the results in a professional report format."""
     timestamp = datetime.now().strftime("%m/%d/%Y %I:%M %p")
     
@@ -119,6 +314,21 @@ def print_results(results):
     print("\n" + "=" * 80)
 
 if __name__ == '__main__':
-    root_dir = r'C:\Users\peter\Documents\projects\segway'
-    results = find_testbenches_with_clk_rst(root_dir)
-    print_results(results)
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Find .sv files with a clock but no reset")
+    parser.add_argument(
+        "root_dir",
+        nargs="?",
+        default=r'C:\Users\peter\Documents\projects\segway',
+        help="Project directory to scan"
+    )
+    parser.add_argument(
+        "--simple",
+        action="store_true",
+        help="Print a plain file list instead of the full report"
+    )
+    args = parser.parse_args()
+    
+    results = find_testbenches_with_clk_rst(args.root_dir)
+    print_results(results, style='simple' if args.simple else 'report')
@@ -7,17 +7,56 @@ for the Segway project using ModelSim/QuestaSim.
 import subprocess
 import sys
 import os
+import re
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+import queue
+import hashlib
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration
 WORK_LIB = "work"
 # ModelSim/QuestaSim flags:
 # -c: command line mode (no GUI)
 # -voptargs=+acc: enable access for debugging/coverage
 # -sv_seed random: randomize seed for SystemVerilog randomization
-VSIM_FLAGS = "-c -voptargs=+acc -sv_seed random"
+SIM_FLAGS = ["-voptargs=+acc", "-sv_seed", "random"]
+VSIM_FLAGS = ["-c", *SIM_FLAGS]
+
+
+def seeded_flags(flags, seed):
+    """Return flags with the random -sv_seed replaced by seed, if one is given"""
+    if seed is None:
+        return flags
+    return [str(seed) if flag == "random" else flag for flag in flags]
+
+# Lines of simulator output kept for the report; the rest is only scanned
+SIM_OUTPUT_TAIL_LINES = 500
+
+# Characters of each result's simulator output kept in the JSON report
+REPORT_OUTPUT_CHARS = 16384
+
+# Pass/fail keywords in simulator output, matched in a single pass per line.
+# "0 errors" and "error" never match at the same offset, so their order does
+# not matter. The rule "an error fails unless '0 errors' appears" holds because
+# SimOutput.feed() sets saw_error for both the zero and err groups.
+STATUS_RE = re.compile(
+    rb'(?P<ok>yahoo|test passed|success)|(?P<zero>0 errors)|(?P<err>error)',
+    re.IGNORECASE
+)
+
+# Records (mtime, size) of each design file as last compiled into WORK_LIB
+COMPILE_CACHE_FILE = ".compile_cache.json"
+
+# vlog error lines look like "** Error: ../PID.sv(42): ..."
+VLOG_ERROR_RE = re.compile(r'\*\* Error[^:]*: (.+?)\((\d+)\)')
 
 # Source files are in the parent directory
 SOURCE_DIR = ".."
@@ -80,6 +119,33 @@ TESTBENCH_SETS = {
     ],
 }
 
+# Display names are the testbench file names; compute them once
+for _testbenches in TESTBENCH_SETS.values():
+    for _tb in _testbenches:
+        _tb["stem"] = Path(_tb["path"]).stem
+
+
+class TestResult:
+    """Outcome of compiling and simulating one testbench"""
+    # No per-instance __dict__; there is one of these per testbench per run
+    __slots__ = ("name", "status", "duration", "module", "seed", "output", "error", "test_set")
+    
+    def __init__(self, name, status, duration, module=None, seed=None,
+                 output=None, error=None, test_set=None):
+        self.name = name
+        self.status = status
+        self.duration = duration
+        self.module = module
+        self.seed = seed
+        self.output = output
+        self.error = error
+        self.test_set = test_set
+    
+    def to_dict(self):
+        """Fields as a dict for the JSON report, leaving out unset ones"""
+        values = ((key, getattr(self, key)) for key in self.__slots__)
+        return {key: value for key, value in values if value is not None}
+
 
 # Make output look pretty
 class Color:
@@ -95,37 +161,187 @@ class Color:
     UNDERLINE = '\033[4m'
 
 
-class TestRunner:
+# Escape codes only make sense on a terminal; drop them when output is piped
+if not sys.stdout.isatty():
+    for _name in [name for name in vars(Color) if name.isupper()]:
+        setattr(Color, _name, '')
+
+
+class SimOutput:
+    """Classifies simulator output as it streams in, keeping only the tail
+    
+    Lines are fed as raw bytes; only the retained tail is ever decoded.
+    """
+    
+    def __init__(self):
+        self.empty = True
+        self.saw_error = False
+        self.saw_zero_errors = False
+        self.saw_pass = False
+        self.tail = deque(maxlen=SIM_OUTPUT_TAIL_LINES)
+    
+    def feed(self, line):
+        """Update the pass/fail flags from one line of output"""
+        self.empty = False
+        for match in STATUS_RE.finditer(line):
+            group = match.lastgroup
+            if group == "ok":
+                self.saw_pass = True
+            else:
+                self.saw_error = True
+                if group == "zero":
+                    self.saw_zero_errors = True
+        self.tail.append(line)
+    
+    @property
+    def text(self):
+        """The retained tail of the output"""
+        return b"".join(self.tail).decode(errors="replace")
+    
+    def status(self, success):
+        """Derive the testbench status from the output and the exit status"""
+        # Check for common success/failure patterns in output
+        if self.empty:
+            return "COMPLETED" if success else "FAILED"
+        if self.saw_error and not self.saw_zero_errors:
+            return "FAILED"
+        elif self.saw_pass:
+            return "PASSED"
+        elif success:
+            return "COMPLETED"
+        else:
+            return "FAILED"
+
+
+class VsimSession:
+    """A long-lived vsim process that simulations are fed to over stdin.
+    
+    Starting vsim (elaboration setup, license checkout) dominates the run time
+    of short simulations, so one process is reused for every testbench.
+    """
+    # Printed by vsim after each simulation. The command that prints it is
+    # lower case so the echoed command line never matches.
+    SENTINEL = b"SEGWAY_TB_DONE"
+    SENTINEL_CMD = "echo [string toupper segway_tb_done]"
+    
     def __init__(self, project_dir):
+        self.project_dir = project_dir
+        self.proc = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def alive(self):
+        """Return True if the vsim process is running"""
+        return self.proc is not None and self.proc.poll() is None
+    
+    def start(self):
+        """Launch vsim in command line mode with no design loaded"""
+        # -onfinish stop: $finish stops the simulation instead of exiting vsim
+        self.proc = subprocess.Popen(
+            ["vsim", "-c", "-onfinish", "stop"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=self.project_dir
+        )
+    
+    def run(self, tb_module, sim_output, work_lib=WORK_LIB, seed=None):
+        """Simulate a testbench module, feeding its output to sim_output
+        
+        A seed replaces the random -sv_seed for this simulation.
+        
+        Returns True if vsim finished the simulation and is ready for the next.
+        """
+        try:
+            if not self.alive():
+                self.start()
+            
+            # -onfinish stop on the load itself keeps $finish from ending the shared process
+            self.proc.stdin.write((
+                f"vsim -onfinish stop {' '.join(seeded_flags(SIM_FLAGS, seed))} {work_lib}.{tb_module}\n"
+                "run -all\n"
+                "quit -sim\n"
+                f"{self.SENTINEL_CMD}\n"
+            ).encode())
+            self.proc.stdin.flush()
+        except OSError as e:
+            sim_output.feed(str(e).encode())
+            return False
+        
+        for line in self.proc.stdout:
+            if self.SENTINEL in line:
+                return True
+            sim_output.feed(line)
+        
+        # vsim exited before finishing the simulation
+        self.proc.wait()
+        return False
+    
+    def close(self):
+        """Quit vsim, killing it if it does not exit"""
+        if not self.alive():
+            return
+        try:
+            self.proc.stdin.write(b"quit -f\n")
+            self.proc.stdin.close()
+            self.proc.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+            self.proc.wait()
+
+
+class TestRunner:
+    def __init__(self, project_dir, jobs=1):
         self.project_dir = Path(project_dir)
+        self.jobs = jobs
         self.results = []
         self.start_time = None
         self.end_time = None
-        
+        self.vsim_session = None
+        # Set once vlog/vsim are found and the design is compiled
+        self.ready = False
+        # Status lines are collected here and written out once per phase
+        self._buf = []
+    
+    def _write(self, line):
+        """Queue a line of output until the next _flush()"""
+        self._buf.append(line)
+    
+    def _flush(self):
+        """Write all queued output in a single call"""
+        if self._buf:
+            sys.stdout.write('\n'.join(self._buf) + '\n')
+            sys.stdout.flush()
+            self._buf.clear()
+    
     def print_header(self, message):
         """Print a formatted header"""
-        print(f"\n{Color.HEADER}{Color.BOLD}{'='*70}{Color.ENDC}")
-        print(f"{Color.HEADER}{Color.BOLD}{message.center(70)}{Color.ENDC}")
-        print(f"{Color.HEADER}{Color.BOLD}{'='*70}{Color.ENDC}\n")
+        self._write(f"\n{Color.HEADER}{Color.BOLD}{'='*70}{Color.ENDC}")
+        self._write(f"{Color.HEADER}{Color.BOLD}{message.center(70)}{Color.ENDC}")
+        self._write(f"{Color.HEADER}{Color.BOLD}{'='*70}{Color.ENDC}\n")
     
     def print_step(self, message):
         """Print a step message"""
-        print(f"{Color.OKCYAN}▶ {message}{Color.ENDC}")
+        self._write(f"{Color.OKCYAN}▶ {message}{Color.ENDC}")
     
     def print_success(self, message):
         """Print a success message"""
-        print(f"{Color.OKGREEN}✓ {message}{Color.ENDC}")
+        self._write(f"{Color.OKGREEN}✓ {message}{Color.ENDC}")
     
     def print_error(self, message):
         """Print an error message"""
-        print(f"{Color.FAIL}✗ {message}{Color.ENDC}")
+        self._write(f"{Color.FAIL}✗ {message}{Color.ENDC}")
     
     def print_warning(self, message):
         """Print a warning message"""
-        print(f"{Color.WARNING}⚠ {message}{Color.ENDC}")
+        self._write(f"{Color.WARNING}⚠ {message}{Color.ENDC}")
     
     def run_command(self, cmd, description="", capture_output=True):
-        """Run a shell command and return success status"""
+        """Run a command (argument list, no shell) and return success status"""
         if description:
             self.print_step(description)
         
@@ -133,7 +349,7 @@ class TestRunner:
             if capture_output:
                 result = subprocess.run(
                     cmd,
-                    shell=True,
+                    shell=False,
                     capture_output=True,
                     text=True,
                     cwd=self.project_dir
@@ -141,7 +357,7 @@ class TestRunner:
             else:
                 result = subprocess.run(
                     cmd,
-                    shell=True,
+                    shell=False,
                     cwd=self.project_dir
                 )
             
@@ -149,17 +365,40 @@ class TestRunner:
                 return True, result.stdout if capture_output else ""
             else:
                 if capture_output and result.stderr:
-                    print(result.stderr)
-                return False, result.stderr if capture_output else ""
+                    self._write(result.stderr)
+                # vlog/vsim report most errors on stdout, so return both streams
+                return False, result.stdout + result.stderr if capture_output else ""
         except Exception as e:
             self.print_error(f"Command failed: {e}")
             return False, str(e)
     
+    def run_streaming(self, cmd, sim_output):
+        """Run a command, feeding its output to sim_output line by line
+        
+        Unlike run_command, the full output is never held in memory.
+        """
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                cwd=self.project_dir
+            )
+        except Exception as e:
+            self.print_error(f"Command failed: {e}")
+            sim_output.feed(str(e).encode())
+            return False
+        
+        with proc:
+            for line in proc.stdout:
+                sim_output.feed(line)
+        return proc.returncode == 0
+    
     def check_modelsim(self):
         """Check if ModelSim/QuestaSim is available"""
         self.print_step("Checking for ModelSim/QuestaSim installation...")
         
-        success, output = self.run_command("vlog -version", capture_output=True)
+        success, output = self.run_command(["vlog", "-version"], capture_output=True)
         if success:
             self.print_success(f"Found ModelSim/QuestaSim")
             return True
@@ -168,18 +407,29 @@ class TestRunner:
             self.print_warning("Please ensure ModelSim or QuestaSim is installed and in your PATH")
             return False
     
-    def create_work_library(self):
-        """Create/recreate the work library"""
+    def create_work_library(self, clean=False):
+        """Create the work library, or reuse it for an incremental compile
+        
+        Args:
+            clean: Delete and recreate the library even if it exists
+        """
+        work_path = self.project_dir / WORK_LIB
+        if work_path.exists() and not clean:
+            self.print_step(f"Reusing existing {WORK_LIB} library...")
+            return True
+        
         self.print_step("Creating work library...")
         
+        # A new library holds nothing, so every file must be recompiled
+        (self.project_dir / COMPILE_CACHE_FILE).unlink(missing_ok=True)
+        
         # Remove existing work library if it exists
-        work_path = self.project_dir / WORK_LIB
         if work_path.exists():
             self.print_step(f"Removing existing {WORK_LIB} library...")
-            success, _ = self.run_command(f"vdel -all -lib {WORK_LIB}")
+            success, _ = self.run_command(["vdel", "-all", "-lib", WORK_LIB])
         
         # Create new work library
-        success, _ = self.run_command(f"vlib {WORK_LIB}")
+        success, _ = self.run_command(["vlib", WORK_LIB])
         if success:
             self.print_success(f"Created {WORK_LIB} library")
             return True
@@ -187,35 +437,146 @@ class TestRunner:
             self.print_error(f"Failed to create {WORK_LIB} library")
             return False
     
+    def _compile_order_hash(self):
+        """Hash of COMPILE_ORDER; the compile cache is void if the order changes"""
+        return hashlib.sha1("\n".join(COMPILE_ORDER).encode()).hexdigest()
+    
+    def _load_compile_cache(self):
+        """Load the compile cache, or an empty one if missing or out of date"""
+        try:
+            with open(self.project_dir / COMPILE_CACHE_FILE, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cache.get("compile_order") != self._compile_order_hash():
+            return {}
+        return cache.get("files", {})
+    
+    def _save_compile_cache(self, cache):
+        """Save the compile cache next to the work library"""
+        report = {"compile_order": self._compile_order_hash(), "files": cache}
+        with open(self.project_dir / COMPILE_CACHE_FILE, 'w') as f:
+            json.dump(report, f, indent=2)
+    
     def compile_design(self):
-        """Compile all design files"""
+        """Compile changed design files in a single vlog invocation"""
         self.print_header("Compiling Design Files")
         
-        all_files = COMPILE_ORDER.copy()
-        
-        failed_files = []
-        compiled_count = 0
+        cache = self._load_compile_cache()
+        stats = {}
+        to_compile = []
+        package_changed = False
         
-        for file in all_files:
+        for file in COMPILE_ORDER:
             file_path = self.project_dir / file
             if not file_path.exists():
                 self.print_warning(f"File not found: {file}, skipping...")
                 continue
             
+            st = file_path.stat()
+            stats[file] = [st.st_mtime, st.st_size]
+            # Everything compiled after a changed package depends on it
+            if package_changed or cache.get(file) != stats[file]:
+                to_compile.append(file)
+                package_changed = package_changed or file.endswith("_pkg.sv")
+            else:
+                self.print_step(f"Up-to-date: {file}")
+        
+        if not to_compile:
+            self.print_success("All design files are up to date")
+            return True
+        
+        self.print_step(f"Compiling {len(to_compile)} design file(s)...")
+        success, output = self.run_command(
+            ["vlog", "-sv", "-work", WORK_LIB, *to_compile],
+            capture_output=True
+        )
+        
+        if success:
+            for file in to_compile:
+                self.print_success(f"✓ {file}")
+                cache[file] = stats[file]
+            self._save_compile_cache(cache)
+            self.print_success(f"\nSuccessfully compiled {len(to_compile)} design file(s)")
+            return True
+        
+        error_files = self.files_with_errors(output, to_compile)
+        retry = self.files_to_retry(error_files, to_compile)
+        self.print_warning("Batch compile failed")
+        if error_files:
+            self.print_error(f"vlog reported errors in: {', '.join(error_files)}")
+        else:
+            # Nothing could be attributed, so every file needs its own pass
+            retry = to_compile
+        
+        # Files without errors are still compiled together in one vlog call
+        rest = [file for file in to_compile if file not in retry]
+        if rest:
+            self.print_step(f"Compiling {len(rest)} design file(s) without errors...")
+            success, _ = self.run_command(
+                ["vlog", "-sv", "-work", WORK_LIB, *rest],
+                capture_output=True
+            )
+            if success:
+                for file in rest:
+                    cache[file] = stats[file]
+            else:
+                retry = to_compile
+        
+        self.print_step(f"Compiling {len(retry)} file(s) one at a time...")
+        success = self.compile_files(retry, cache, stats)
+        self._save_compile_cache(cache)
+        return success
+    
+    def files_to_retry(self, error_files, files):
+        """Files to compile one at a time after a failed batch
+        
+        These are the files vlog reported errors in, plus every file after a
+        failed package, since those import it.
+        """
+        retry = []
+        package_failed = False
+        for file in files:
+            if package_failed or file in error_files:
+                retry.append(file)
+                package_failed = package_failed or (file in error_files and file.endswith("_pkg.sv"))
+        return retry
+    
+    def files_with_errors(self, output, files):
+        """Map vlog error messages back to the files they came from"""
+        names = {Path(file).name: file for file in files}
+        error_files = []
+        for match in VLOG_ERROR_RE.finditer(output or ""):
+            file = names.get(Path(match.group(1)).name)
+            if file and file not in error_files:
+                error_files.append(file)
+        return error_files
+    
+    def compile_files(self, files, cache, stats):
+        """Compile files one vlog invocation at a time for exact error reporting
+        
+        Files that compile are recorded in cache using their entry in stats.
+        """
+        failed_files = []
+        compiled_count = 0
+        
+        for file in files:
             self.print_step(f"Compiling {file}...")
             success, output = self.run_command(
-                f"vlog -sv -work {WORK_LIB} {file}",
+                ["vlog", "-sv", "-work", WORK_LIB, file],
                 capture_output=True
             )
             
             if success:
                 self.print_success(f"✓ {file}")
+                cache[file] = stats[file]
                 compiled_count += 1
             else:
                 self.print_error(f"✗ {file}")
+                cache.pop(file, None)
                 failed_files.append(file)
                 if output:
-                    print(f"  Error output:\n{output}")
+                    self._write(f"  Error output:\n{output}")
         
         if failed_files:
             self.print_error(f"\nFailed to compile {len(failed_files)} file(s)")
@@ -224,69 +585,75 @@ class TestRunner:
         self.print_success(f"\nSuccessfully compiled {compiled_count} design file(s)")
         return True
     
-    def run_testbench(self, tb_module, tb_path, display_name=None):
+    def run_testbench(self, tb_module, tb_path, display_name=None, work_lib=WORK_LIB, seed=None,
+                      flush_progress=True):
         """Compile and run a single testbench
         
         Args:
             tb_module: The actual module name inside the .sv file
             tb_path: Path to the testbench file
             display_name: Optional name for display (defaults to tb_path basename)
+            work_lib: Library to compile the testbench into; libraries other than
+                WORK_LIB reference the compiled design in WORK_LIB via -L
+            seed: Fixed -sv_seed for the simulation (defaults to random)
+            flush_progress: Flush status lines before blocking on vlog/vsim;
+                parallel jobs pass False so each test's output prints as one block
         """
         if display_name is None:
             display_name = Path(tb_path).stem
         
-        print(f"\n{Color.OKBLUE}{'─'*70}{Color.ENDC}")
-        print(f"{Color.OKBLUE}{Color.BOLD}Running: {display_name}{Color.ENDC}")
-        print(f"{Color.OKBLUE}{'─'*70}{Color.ENDC}")
+        self._write(f"\n{Color.OKBLUE}{'─'*70}{Color.ENDC}")
+        self._write(f"{Color.OKBLUE}{Color.BOLD}Running: {display_name}{Color.ENDC}")
+        self._write(f"{Color.OKBLUE}{'─'*70}{Color.ENDC}")
         
         start = datetime.now()
         
+        # Testbenches in their own library still need the shared design library
+        lib_flags = ["-L", WORK_LIB] if work_lib != WORK_LIB else []
+        
         # Compile testbench
         self.print_step(f"Compiling {tb_path}...")
+        # Show which test is running before blocking on vlog/vsim
+        if flush_progress:
+            self._flush()
         success, output = self.run_command(
-            f"vlog -sv -work {WORK_LIB} {tb_path}",
+            ["vlog", "-sv", "-work", work_lib, *lib_flags, tb_path],
             capture_output=True
         )
         
         if not success:
             self.print_error(f"Failed to compile {display_name}")
             if output:
-                print(output)
+                self._write(output)
             end = datetime.now()
-            return {
-                "name": display_name,
-                "status": "COMPILE_FAILED",
-                "duration": (end - start).total_seconds(),
-                "error": output
-            }
+            return TestResult(
+                name=display_name,
+                status="COMPILE_FAILED",
+                duration=(end - start).total_seconds(),
+                error=output
+            )
         
         self.print_success(f"Compiled {display_name}")
         
         # Run simulation using the actual module name
         self.print_step(f"Running simulation (module: {tb_module})...")
-        # Use onfinish stop to prevent auto-quit, then explicitly quit
-        # This gives us better control and captures all output
-        success, output = self.run_command(
-            f"vsim {VSIM_FLAGS} -do \"run -all; quit -f\" {WORK_LIB}.{tb_module}",
-            capture_output=True
-        )
+        if flush_progress:
+            self._flush()
+        sim_output = SimOutput()
+        if self.vsim_session is not None:
+            success = self.vsim_session.run(tb_module, sim_output, work_lib, seed)
+        else:
+            vsim_flags = seeded_flags(VSIM_FLAGS, seed)
+            # Use onfinish stop to prevent auto-quit, then explicitly quit
+            # This gives us better control and captures all output
+            success = self.run_streaming(
+                ["vsim", *vsim_flags, *lib_flags, "-do", "run -all; quit -f", f"{work_lib}.{tb_module}"],
+                sim_output
+            )
         
         end = datetime.now()
         duration = (end - start).total_seconds()
-        
-        # Check for common success/failure patterns in output
-        if output:
-            output_lower = output.lower()
-            if "error" in output_lower and "0 errors" not in output_lower:
-                status = "FAILED"
-            elif "yahoo" in output_lower or "test passed" in output_lower or "success" in output_lower:
-                status = "PASSED"
-            elif success:
-                status = "COMPLETED"
-            else:
-                status = "FAILED"
-        else:
-            status = "COMPLETED" if success else "FAILED"
+        status = sim_output.status(success)
         
         if status == "PASSED":
             self.print_success(f"✓ {display_name} PASSED ({duration:.2f}s)")
@@ -295,13 +662,14 @@ class TestRunner:
         else:
             self.print_warning(f"○ {display_name} COMPLETED ({duration:.2f}s)")
         
-        return {
-            "name": display_name,
-            "module": tb_module,
-            "status": status,
-            "duration": duration,
-            "output": output
-        }
+        return TestResult(
+            name=display_name,
+            module=tb_module,
+            status=status,
+            duration=duration,
+            seed=seed,
+            output=sim_output.text
+        )
     
     def run_all_testbenches(self, test_set="tests"):
         """Run all testbenches from the specified set"""
@@ -313,31 +681,91 @@ class TestRunner:
         testbenches = TESTBENCH_SETS[test_set]
         self.print_header(f"Running Testbenches from '{test_set}' ({len(testbenches)} tests)")
         
+        if self.jobs > 1:
+            for result in self.run_testbenches_parallel(testbenches):
+                result.test_set = test_set
+                self.results.append(result)
+            return
+        
+        # Share one vsim process across every set this runner runs
+        if self.vsim_session is None:
+            self.vsim_session = VsimSession(self.project_dir)
+        
         for tb in testbenches:
             # Use the file basename as display name
-            display_name = Path(tb["path"]).stem
-            result = self.run_testbench(tb["module"], tb["path"], display_name)
+            result = self.run_testbench(tb["module"], tb["path"], tb["stem"])
+            result.test_set = test_set
             self.results.append(result)
+            self._flush()
+    
+    def run_testbenches_parallel(self, testbenches):
+        """Run testbenches concurrently, each in its own work library
+        
+        Testbenches share module names, so each running job compiles into a
+        private work_<n> library that references the design in WORK_LIB.
+        Each testbench gets a fixed seed derived from its index so runs are
+        reproducible.
+        """
+        jobs = min(self.jobs, len(testbenches))
+        self._flush()
+        
+        # Hand out libraries through a queue so no two jobs share one
+        free_libs = queue.Queue()
+        for i in range(jobs):
+            lib = f"{WORK_LIB}_{i}"
+            if not (self.project_dir / lib).exists():
+                success, _ = self.run_command(["vlib", lib])
+                if not success:
+                    self.print_error(f"Failed to create {lib} library")
+            free_libs.put(lib)
+        
+        def run_job(index, tb):
+            lib = free_libs.get()
+            try:
+                # A separate runner per job keeps per-test state apart
+                runner = TestRunner(self.project_dir)
+                result = runner.run_testbench(
+                    tb["module"], tb["path"], tb["stem"],
+                    work_lib=lib, seed=index + 1, flush_progress=False
+                )
+                runner._flush()
+                return result
+            finally:
+                free_libs.put(lib)
+        
+        results = [None] * len(testbenches)
+        with ThreadPoolExecutor(max_workers=jobs) as ex:
+            futures = {ex.submit(run_job, i, tb): i for i, tb in enumerate(testbenches)}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
     
-    def print_summary(self):
-        """Print test summary"""
+    def print_summary(self, results=None):
+        """Print test summary
+        
+        Args:
+            results: Results to summarize (defaults to every result so far)
+        """
+        if results is None:
+            results = self.results
+        
         self.print_header("Test Summary")
         
-        passed = sum(1 for r in self.results if r["status"] == "PASSED")
-        failed = sum(1 for r in self.results if r["status"] == "FAILED")
-        compile_failed = sum(1 for r in self.results if r["status"] == "COMPILE_FAILED")
-        completed = sum(1 for r in self.results if r["status"] == "COMPLETED")
-        total = len(self.results)
+        passed = sum(1 for r in results if r.status == "PASSED")
+        failed = sum(1 for r in results if r.status == "FAILED")
+        compile_failed = sum(1 for r in results if r.status == "COMPILE_FAILED")
+        completed = sum(1 for r in results if r.status == "COMPLETED")
+        total = len(results)
         
-        total_duration = sum(r["duration"] for r in self.results)
+        total_duration = sum(r.duration for r in results)
         
-        print(f"{'Testbench':<30} {'Status':<15} {'Duration':>10}")
-        print(f"{'-'*57}")
+        self._write(f"{'Testbench':<30} {'Status':<15} {'Duration':>10}")
+        self._write(f"{'-'*57}")
         
-        for result in self.results:
-            name = result["name"]
-            status = result["status"]
-            duration = result["duration"]
+        for result in results:
+            name = result.name
+            status = result.status
+            duration = result.duration
             
             if status == "PASSED":
                 color = Color.OKGREEN
@@ -352,50 +780,71 @@ class TestRunner:
                 color = Color.WARNING
                 symbol = "○"
             
-            print(f"{name:<30} {color}{symbol} {status:<14}{Color.ENDC} {duration:>8.2f}s")
+            self._write(f"{name:<30} {color}{symbol} {status:<14}{Color.ENDC} {duration:>8.2f}s")
         
-        print(f"{'-'*57}")
-        print(f"\n{Color.BOLD}Results:{Color.ENDC}")
-        print(f"  {Color.OKGREEN}Passed:{Color.ENDC}          {passed}/{total}")
-        print(f"  {Color.FAIL}Failed:{Color.ENDC}          {failed}/{total}")
-        print(f"  {Color.FAIL}Compile Failed:{Color.ENDC}  {compile_failed}/{total}")
-        print(f"  {Color.WARNING}Completed:{Color.ENDC}       {completed}/{total}")
-        print(f"\n{Color.BOLD}Total Duration:{Color.ENDC}   {total_duration:.2f}s")
+        self._write(f"{'-'*57}")
+        self._write(f"\n{Color.BOLD}Results:{Color.ENDC}")
+        self._write(f"  {Color.OKGREEN}Passed:{Color.ENDC}          {passed}/{total}")
+        self._write(f"  {Color.FAIL}Failed:{Color.ENDC}          {failed}/{total}")
+        self._write(f"  {Color.FAIL}Compile Failed:{Color.ENDC}  {compile_failed}/{total}")
+        self._write(f"  {Color.WARNING}Completed:{Color.ENDC}       {completed}/{total}")
+        self._write(f"\n{Color.BOLD}Total Duration:{Color.ENDC}   {total_duration:.2f}s")
         
         # Overall status
         if compile_failed > 0 or failed > 0:
-            print(f"\n{Color.FAIL}{Color.BOLD}OVERALL: FAILURES DETECTED{Color.ENDC}")
+            self._write(f"\n{Color.FAIL}{Color.BOLD}OVERALL: FAILURES DETECTED{Color.ENDC}")
             return False
         elif passed > 0:
-            print(f"\n{Color.OKGREEN}{Color.BOLD}OVERALL: ALL TESTS PASSED{Color.ENDC}")
+            self._write(f"\n{Color.OKGREEN}{Color.BOLD}OVERALL: ALL TESTS PASSED{Color.ENDC}")
             return True
         else:
-            print(f"\n{Color.WARNING}{Color.BOLD}OVERALL: TESTS COMPLETED{Color.ENDC}")
+            self._write(f"\n{Color.WARNING}{Color.BOLD}OVERALL: TESTS COMPLETED{Color.ENDC}")
             return True
     
     def save_results(self, filename="test_results.json"):
         """Save test results to JSON file"""
         results_file = self.project_dir / filename
         
+        # Keep only the end of the output, where pass/fail messages are
+        results = []
+        for result in self.results:
+            result = result.to_dict()
+            for key in ("output", "error"):
+                if result.get(key):
+                    result[key] = result[key][-REPORT_OUTPUT_CHARS:]
+            results.append(result)
+        
         report = {
             "timestamp": self.start_time.isoformat() if self.start_time else None,
             "duration": (self.end_time - self.start_time).total_seconds() if self.end_time and self.start_time else 0,
-            "results": self.results
+            "results": results
         }
         
-        with open(results_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        if orjson is not None:
+            with open(results_file, 'wb') as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            with open(results_file, 'w') as f:
+                json.dump(report, f, separators=(',', ':'))
         
         self.print_step(f"Results saved to {filename}")
     
-    def run(self, skip_compile=False, test_set="tests"):
+    def run(self, skip_compile=False, test_set="tests", clean=False):
         """Main execution flow"""
+        try:
+            return self._run(skip_compile=skip_compile, test_set=test_set, clean=clean)
+        finally:
+            self._flush()
+    
+    def _run(self, skip_compile, test_set, clean):
+        """Execution flow for run(), flushing output after each phase"""
         self.start_time = datetime.now()
         
         self.print_header("Segway Testbench Runner")
-        print(f"Project Directory: {self.project_dir}")
-        print(f"Test Set: {test_set}")
-        print(f"Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self._write(f"Project Directory: {self.project_dir}")
+        self._write(f"Test Set: {test_set}")
+        self._write(f"Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self._flush()
         
         # Check for ModelSim
         if not self.check_modelsim():
@@ -403,15 +852,19 @@ class TestRunner:
         
         if not skip_compile:
             # Create work library
-            if not self.create_work_library():
+            if not self.create_work_library(clean=clean):
                 return False
+            self._flush()
             
             # Compile design
             if not self.compile_design():
                 self.print_error("Design compilation failed. Cannot continue.")
                 return False
+            self._flush()
         else:
             self.print_warning("Skipping compilation (using existing work library)")
+        self.ready = True
+        self._flush()
         
         # Run all testbenches
         self.run_all_testbenches(test_set=test_set)
@@ -425,6 +878,29 @@ class TestRunner:
         self.save_results()
         
         return success
+    
+    def run_only_tests(self, test_set):
+        """Run another test set against the library compiled by run()
+        
+        Skips the ModelSim check and compilation, reuses the vsim session,
+        and summarizes only this set's results. The saved report holds the
+        results of every set run so far, tagged with test_set.
+        """
+        try:
+            first = len(self.results)
+            self.run_all_testbenches(test_set=test_set)
+            self.end_time = datetime.now()
+            success = self.print_summary(self.results[first:])
+            self.save_results()
+            return success
+        finally:
+            self._flush()
+    
+    def close(self):
+        """Shut down the shared vsim session"""
+        if self.vsim_session is not None:
+            self.vsim_session.close()
+            self.vsim_session = None
 
 
 def interactive_menu():
@@ -481,6 +957,7 @@ Examples:
   python run_all_testbenches.py --set tests        # Run specific set
   python run_all_testbenches.py --set all          # Run all sets
   python run_all_testbenches.py --skip-compile --set ansley
+  python run_all_testbenches.py --set tests --jobs 4
 """
     )
     parser.add_argument(
@@ -488,11 +965,22 @@ Examples:
         action="store_true",
         help="Skip compilation and use existing work library"
     )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Recreate the work library and recompile every design file"
+    )
     parser.add_argument(
         "--dir",
         default=".",
         help="Project directory (default: current directory)"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of testbenches to simulate in parallel (default: 1)"
+    )
     parser.add_argument(
         "--set",
         choices=list(TESTBENCH_SETS.keys()) + ["all"],
@@ -508,6 +996,10 @@ Examples:
         print(f"Error: Directory '{project_dir}' does not exist")
         sys.exit(1)
     
+    if args.jobs < 1:
+        print("Error: --jobs must be at least 1")
+        sys.exit(1)
+    
     # Interactive mode if no --set specified
     if args.set is None:
         selected_set = interactive_menu()
@@ -516,27 +1008,33 @@ Examples:
     else:
         selected_set = args.set
     
-    # Handle 'all' option
-    if selected_set == "all":
-        overall_success = True
-        for test_set in TESTBENCH_SETS.keys():
-            print(f"\n{'='*70}")
-            print(f"Running test set: {test_set}")
-            print(f"{'='*70}\n")
-            
-            runner = TestRunner(project_dir)
-            # Only compile on first run
-            skip_compile = args.skip_compile or (test_set != list(TESTBENCH_SETS.keys())[0])
-            success = runner.run(skip_compile=skip_compile, test_set=test_set)
-            
-            if not success:
-                overall_success = False
-        
-        sys.exit(0 if overall_success else 1)
-    else:
-        runner = TestRunner(project_dir)
-        success = runner.run(skip_compile=args.skip_compile, test_set=selected_set)
-        sys.exit(0 if success else 1)
+    runner = TestRunner(project_dir, jobs=args.jobs)
+    try:
+        # Handle 'all' option
+        if selected_set == "all":
+            overall_success = True
+            for test_set in TESTBENCH_SETS.keys():
+                print(f"\n{'='*70}")
+                print(f"Running test set: {test_set}")
+                print(f"{'='*70}\n")
+                
+                # Only check and compile on the first run
+                if not runner.ready:
+                    success = runner.run(skip_compile=args.skip_compile, test_set=test_set, clean=args.clean)
+                    if not runner.ready:
+                        overall_success = False
+                        break
+                else:
+                    success = runner.run_only_tests(test_set)
+                
+                if not success:
+                    overall_success = False
+        else:
+            overall_success = runner.run(skip_compile=args.skip_compile, test_set=selected_set, clean=args.clean)
+    finally:
+        runner.close()
+    
+    sys.exit(0 if overall_success else 1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,16 @@
+"""
+Build the optional C clock/reset scanner used by find_clocks_with_rst.py.
+
+    python setup.py build_ext --inplace
+
+find_clocks_with_rst.py falls back to its pure Python scan if the extension
+has not been built.
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="clk_scan",
+    ext_modules=cythonize("clk_scan.pyx"),
+)